@@ -24,9 +24,17 @@ C-friendly example is given in the comments below.
 """
 
 import json
+import numpy as np
 import pandas as pd
 import sys
 
+# orjson is optional; it serializes the (large) index several times faster
+# than the stdlib encoder, which falls back to pure python with indent=2
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # copy of the merge logic from ensemble_predict.py / train.py
 feature_files = [
@@ -61,46 +69,46 @@ base = {'r_fighter', 'b_fighter', 'winner', 'weight_class'}
 features = [c for c in df.columns if c not in base]
 clean = df.dropna(subset=features).reset_index(drop=True)
 
-# build index
+# build index.  fighters get integer ids (in order of first appearance) so
+# the per-feature sums live in flat [n_fighters, n_features] arrays
+# instead of a dict of floats per fighter.  red and blue corners are
+# interleaved so every fighter's bouts are visited in dataset order.
+n = len(clean)
+values = clean[features].to_numpy(dtype=float)
+flip = np.array([('diff' in f or f.endswith('_delta')) for f in features], dtype=bool)
+
+names = np.empty(2 * n, dtype=object)
+names[0::2] = clean['r_fighter'].to_numpy()
+names[1::2] = clean['b_fighter'].to_numpy()
+ids, fighters = pd.factorize(names, use_na_sentinel=False)
+
+# stats from the perspective of each fighter; flip diffs for blue
+per_corner = np.empty((2 * n, len(features)))
+per_corner[0::2] = values
+per_corner[1::2] = np.where(flip, -values, values)
+
+sums = np.zeros((len(fighters), len(features)))
+np.add.at(sums, ids, per_corner)
+counts = np.bincount(ids, minlength=len(fighters))
+means = sums / counts[:, None]
+
+fights = [[] for _ in fighters]
+wcs = clean['weight_class'] if 'weight_class' in clean.columns else [''] * n
+for rid, bid, wc, winner in zip(ids[0::2], ids[1::2], wcs, clean['winner']):
+    fights[rid].append({'opponent': fighters[bid], 'won': winner == 'Red', 'weight_class': wc})
+    fights[bid].append({'opponent': fighters[rid], 'won': winner == 'Blue', 'weight_class': wc})
+
 index = {}
-for _, row in clean.iterrows():
-    rname = row['r_fighter']
-    bname = row['b_fighter']
-    wc = row.get('weight_class', '')
-    winner = row['winner']
-
-    for fighter, opponent, is_red in [(rname, bname, True), (bname, rname, False)]:
-        entry = index.setdefault(fighter, {
-            'fights': [],
-            'stats_acc': {f: 0.0 for f in features},
-            'count': 0,
-        })
-
-        entry['fights'].append({
-            'opponent': opponent,
-            'won': winner == ('Red' if is_red else 'Blue'),
-            'weight_class': wc,
-        })
-
-        # accumulate stats from perspective of this fighter; flip diffs
-        for f in features:
-            val = row[f]
-            if isinstance(val, (int, float)):
-                if (not is_red) and ('diff' in f or f.endswith('_delta')):
-                    val = -val
-                entry['stats_acc'][f] += val
-        entry['count'] += 1
-
-# convert accumulators to means
-for fighter, data in index.items():
-    cnt = data.pop('count')
-    acc = data.pop('stats_acc')
-    if cnt > 0:
-        data['mean_stats'] = {f: acc[f] / cnt for f in features}
-    else:
-        data['mean_stats'] = {}
-
-json.dump(index, fp=sys.stdout, indent=2, sort_keys=True)
+for i, fighter in enumerate(fighters):
+    index[fighter] = {
+        'fights': fights[i],
+        'mean_stats': dict(zip(features, means[i].tolist())),
+    }
+
+if orjson is not None:
+    sys.stdout.buffer.write(orjson.dumps(index, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+else:
+    json.dump(index, fp=sys.stdout, indent=2, sort_keys=True)
 
 # --- C example ---------------------------------------------------------
 #
@@ -21,6 +21,23 @@ The output uses the same feature ordering as ``model_weights.h`` so that the
 import json, re, sys
 import pandas as pd
 
+# compiled once up front rather than on every header line
+FEATURE_NAME_RE = re.compile(r"\s*\"(.*?)\",")
+
+
+# str.translate table for sanitize(): ascii letters/digits map to themselves,
+# anything else to '_'.  entries are filled in the first time a character is
+# seen, so names with accents etc. don't need a precomputed unicode table.
+class _IdentTable(dict):
+    def __missing__(self, code):
+        ch = chr(code)
+        value = code if ch.isascii() and ch.isalnum() else ord('_')
+        self[code] = value
+        return value
+
+
+IDENT_TABLE = _IdentTable()
+
 # reuse merging logic from earlier
 feature_files = [
     'extract/age/age.tsv',
@@ -58,9 +75,13 @@ if not os.path.exists('model_weights.h'):
 feature_names = []
 with open('model_weights.h') as f:
     for line in f:
-        m = re.match(r"\s*\"(.*?)\",", line)
+        m = FEATURE_NAME_RE.match(line)
         if m:
             feature_names.append(m.group(1))
+        elif feature_names:
+            # the names are one contiguous block near the top; everything
+            # after it is weight arrays, so stop instead of matching those
+            break
 
 # build fighter averages same as before
 
@@ -69,49 +90,49 @@ base = {'r_fighter','b_fighter','winner','weight_class'}
 features = [c for c in df.columns if c not in base]
 clean = df.dropna(subset=features).reset_index(drop=True)
 
-# compute per-fighter means with diff flipping
-players = {}
-
+# compute per-fighter means with diff flipping.  each bout contributes one
+# row per corner to a long table, so the averaging is a single groupby
+# rather than a python loop over every bout and column.
 diff_cols = [c for c in clean.columns if 'diff' in c and c not in base]
 raw_cols = [c for c in clean.columns if c not in base and c not in diff_cols and not c.startswith('r_') and not c.startswith('b_')]
-
-for _, row in clean.iterrows():
-    r = row['r_fighter']; b = row['b_fighter']; wc = row.get('weight_class', None)
-    winner = row['winner']
-    for fighter, opp, is_red in [(r, b, True), (b, r, False)]:
-        if fighter not in players:
-            players[fighter] = {'diff':{}, 'raw':{}, 'weight_class':wc, 'count':0}
-        ent = players[fighter]
-        ent['fights'] = ent.get('fights', [])
-        ent['fights'].append((opp, winner == ('Red' if is_red else 'Blue'), wc))
-        # accumulate stats
-        for c in diff_cols:
-            v = row[c]
-            if not is_red and pd.notna(v):
-                v = -v
-            ent['diff'][c] = ent['diff'].get(c, 0.0) + (v if pd.notna(v) else 0.0)
-        for c in raw_cols:
-            v = row[c]
-            ent['raw'][c] = ent['raw'].get(c, 0.0) + (v if pd.notna(v) else 0.0)
-        ent['count'] += 1
-
-# convert to means
-for fighter, ent in players.items():
-    cnt = ent['count']
-    if cnt > 0:
-        for c in list(ent['diff'].keys()):
-            ent['diff'][c] /= cnt
-        for c in list(ent['raw'].keys()):
-            ent['raw'][c] /= cnt
+stat_cols = diff_cols + raw_cols
+
+wc_col = clean['weight_class'] if 'weight_class' in clean.columns else None
+red = clean[stat_cols].assign(fighter=clean['r_fighter'], opponent=clean['b_fighter'],
+                              won=clean['winner'] == 'Red', weight_class=wc_col)
+blue = clean[stat_cols].assign(fighter=clean['b_fighter'], opponent=clean['r_fighter'],
+                               won=clean['winner'] == 'Blue', weight_class=wc_col)
+blue[diff_cols] = -blue[diff_cols]
+# stable sort puts red before blue within each bout, matching the old
+# row-by-row order so fighters and their fights are emitted identically
+long = pd.concat([red, blue]).sort_index(kind='stable')
+
+grouped = long.groupby('fighter', sort=False, dropna=False)
+diff_means = grouped[diff_cols].mean().to_dict('index')
+raw_means = grouped[raw_cols].mean().to_dict('index')
+players = {}
+for fighter, grp in grouped:
+    players[fighter] = {
+        'diff': diff_means[fighter],
+        'raw': raw_means[fighter],
+        'weight_class': grp['weight_class'].iloc[0],
+        'fights': list(zip(grp['opponent'], grp['won'], grp['weight_class'])),
+    }
 
 # now create C source
 
 def sanitize(name):
-    return re.sub(r'[^A-Za-z0-9]', '_', name)
+    return name.translate(IDENT_TABLE)
+
+# value for one feature: the fighter's diff mean, else raw mean, else 0
+def _stat(ent, fn):
+    v = ent['diff'].get(fn)
+    return v if v is not None else ent['raw'].get(fn, 0.0)
 
-# open files for writing
+# open files for writing; the .c file runs to tens of megabytes written in
+# small pieces, so give it a 1 MiB buffer instead of the 8 KiB default
 hfile = open('fighter_index_data.h','w')
-cfile = open('fighter_index_data.c','w')
+cfile = open('fighter_index_data.c','w', buffering=1 << 20)
 
 hfile.write('#ifndef FIGHTER_INDEX_DATA_H\n')
 hfile.write('#define FIGHTER_INDEX_DATA_H\n\n')
@@ -132,32 +153,24 @@ cfile.write('#include <stddef.h>\n\n')
 # generate fights arrays and fighter structs
 cfile.write('/* automatically generated fighter data */\n\n')
 
+# one pass per fighter emits its fights array followed by its mean_stats
+# array; both are static definitions that only need to precede fighters[]
 for idx,(fighter, ent) in enumerate(players.items()):
     fname = sanitize(fighter)
     # fights
     fights = ent.get('fights', [])
     cfile.write(f'static Fight fights_{fname}[] = {{\n')
     for opp, won, wc in fights:
-        wc_str = wc if wc is not None else "\"\""
         cfile.write(f'    {{ "{opp}", {1 if won else 0}, "{wc if wc is not None else ""}", NULL }},\n')
     cfile.write('};\n\n')
 
-# feature names array is global from model_weights.h; we'll assume same order
-
-# for each fighter, output mean_stats array
-for idx,(fighter, ent) in enumerate(players.items()):
-    fname = sanitize(fighter)
+    # mean_stats; feature names array is global from model_weights.h,
+    # we'll assume same order
     cfile.write(f'static double stats_{fname}[MODEL_INPUT_DIM] = {{')
     # compute v1-v2 earlier? no, we just store fighter means; prediction will subtract
-    # Need to match order of feature_names
-    for i,fn in enumerate(feature_names):
-        # value from diff or raw or 0
-        v = ent['diff'].get(fn)
-        if v is None:
-            v = ent['raw'].get(fn, 0.0)
-        cfile.write(f'{v:.6e}')
-        if i != len(feature_names)-1:
-            cfile.write(', ')
+    # Need to match order of feature_names.  the row is joined from a
+    # generator and written once rather than as two small writes per feature
+    cfile.write(', '.join(f'{_stat(ent, fn):.6e}' for fn in feature_names))
     cfile.write('};\n')
 
 # now create Fighter array with pointers
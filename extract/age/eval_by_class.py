@@ -78,9 +78,18 @@ def main():
         pattern = os.path.join(os.path.dirname(__file__), 'age_*.tsv')
         source_files = [f for f in glob.glob(pattern) if os.path.basename(f) != 'age.tsv']
 
+    # each source is parsed once and then filtered per class in memory,
+    # rather than re-reading every file for every checkpoint
+    frames = {}
+
+    def read_source(path):
+        if path not in frames:
+            frames[path] = pd.read_csv(path, sep='\t')
+        return frames[path]
+
     # helper to load and filter by class
     def load_for_class(path, cls):
-        df = pd.read_csv(path, sep='\t')
+        df = read_source(path)
         if 'weight_class' in df.columns:
             df = df[df['weight_class'] == cls]
         return df
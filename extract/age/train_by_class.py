@@ -91,9 +91,18 @@ def main():
         # explicit feature tables -> merge them per class
         source_files = args.data
 
+        # each source is parsed once and then filtered per class in
+        # memory, rather than re-reading every file for every class
+        frames = {}
+
+        def read_source(path):
+            if path not in frames:
+                frames[path] = pd.read_csv(path, sep='\t')
+            return frames[path]
+
         # helper used by get_class_df below
         def load_for_class(path, cls):
-            df = pd.read_csv(path, sep='\t')
+            df = read_source(path)
             if 'weight_class' in df.columns:
                 df = df[df['weight_class'] == cls]
             return df
@@ -109,7 +118,7 @@ def main():
             return df
 
         # get classes from first source without filtering
-        first = pd.read_csv(source_files[0], sep='\t')
+        first = read_source(source_files[0])
         if first.empty or 'weight_class' not in first.columns:
             print('no data sources found, exiting')
             return
@@ -190,7 +199,9 @@ def main():
             else:
                 # perform exhaustive grid search for this class
                 def parse_list(s, cast):
-                    return [cast(x) for x in s.split(',')] if s else []
+                    # repeated values (e.g. '1e-3,0.001') would train the same
+                    # configuration twice, so keep only the first of each
+                    return list(dict.fromkeys(cast(x) for x in s.split(','))) if s else []
                 lrs = parse_list(args.lr_values, float)
                 batches = parse_list(args.batch_values, int)
                 epochs_list = parse_list(args.epoch_values, int)
@@ -12,9 +12,9 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner', 'weight_class']
     cols = ['age_diff']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     existing = [c for c in cols if c in df.columns]
     if not existing:
         print("No relevant columns found for Age Delta in dataset.")
@@ -16,8 +16,9 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
+    cols = ['td_avg_diff', 'sub_avg_diff']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     parts = []
     if 'td_avg_diff' in df.columns:
         parts.append(df['td_avg_diff'])
@@ -13,10 +13,10 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
     # 'height_diff' column represents difference in height between fighters (cm).
     cols = ['height_diff']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     existing = [c for c in cols if c in df.columns]
     if not existing:
         print("No relevant columns found for Height Delta in dataset.")
@@ -17,16 +17,20 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
+    # only the fighter names and outcome are needed out of the wide dataset
+    df = pd.read_csv(DATA_PATH, usecols=['r_fighter', 'b_fighter', 'winner'])
     # we'll compute a running count of prior wins for each pair of fighters.
     # canonical_key is a tuple of the two names sorted lexicographically so that
     # events where the fighters swap red/blue sides are still grouped together.
     history: dict[tuple[str, str], dict[str, int]] = {}
     prev_wins = []
-    for idx, row in df.iterrows():
-        ra = row['r_fighter']
-        ba = row['b_fighter']
-        key = tuple(sorted([ra, ba]))
+    # iterrows builds a Series per bout; walking the raw columns keeps this
+    # sequential pass cheap on the full dataset.
+    for ra, ba, winner in zip(df['r_fighter'].to_numpy(),
+                              df['b_fighter'].to_numpy(),
+                              df['winner'].to_numpy()):
+        # same ordering as sorted(), without building a list per bout
+        key = (ra, ba) if ra <= ba else (ba, ra)
         pair_hist = history.setdefault(key, {})
         # how many times has each fighter beaten the other before this row?
         ra_wins = pair_hist.get(ra, 0)
@@ -34,7 +38,6 @@ def extract():
         # store difference (red minus blue)
         prev_wins.append(ra_wins - ba_wins)
         # update history with this fight's outcome
-        winner = row['winner']
         if winner == 'Red':
             pair_hist[ra] = ra_wins + 1
         elif winner == 'Blue':
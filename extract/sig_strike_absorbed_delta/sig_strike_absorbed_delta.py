@@ -12,11 +12,11 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
     # the dataset does not explicitly label absorbed strikes, but
     # 'sig_str_att_diff' may serve as a proxy (strikes attempted on the opponent)
     cols = ['sig_str_att_diff']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     existing = [c for c in cols if c in df.columns]
     if not existing:
         print("No relevant columns found for Sig Strike Absorbed Delta in dataset.")
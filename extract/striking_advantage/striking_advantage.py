@@ -17,8 +17,9 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
+    cols = ['sig_str_diff', 'sig_str_att_diff']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     # try to compute advantage from significant strikes and absorbed proxies
     if 'sig_str_diff' in df.columns:
         # use sig_str_att_diff as an approximation for absorbed
@@ -12,11 +12,11 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
     # the dataset contains r_wins_total and b_wins_total but not a
     # consecutive wins value.  We return the totals as a proxy.
     cols = ['r_wins_total', 'b_wins_total']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols or c in cols)
     existing = [c for c in cols if c in df.columns]
     if not existing:
         print("No win total columns found in dataset.")
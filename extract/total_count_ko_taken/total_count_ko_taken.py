@@ -15,8 +15,8 @@ DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..',
 
 
 def extract():
-    df = pd.read_csv(DATA_PATH)
     base_cols = ['r_fighter', 'b_fighter', 'winner']
+    df = pd.read_csv(DATA_PATH, usecols=lambda c: c in base_cols)
     print("No KO taken count column present in dataset.")
     return df[base_cols].copy()
 
@@ -157,7 +157,9 @@ def main():
         if args.search:
             # build value lists
             def parse_list(s, cast):
-                return [cast(x) for x in s.split(',')] if s else []
+                # repeated values (e.g. '1e-3,0.001') would train the same
+                # configuration twice, so keep only the first of each
+                return list(dict.fromkeys(cast(x) for x in s.split(','))) if s else []
             lrs = parse_list(args.lr_values, float)
             batches = parse_list(args.batch_values, int)
             epochs_list = parse_list(args.epoch_values, int)
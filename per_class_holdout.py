@@ -37,8 +37,10 @@ epochs=20
 lr=0.001
 
 results = []
-for wc in classes:
-    df = full[full['weight_class']==wc].reset_index(drop=True)
+# a single groupby partitions the rows in one pass instead of scanning the
+# full frame with a boolean mask for every class (keys come out sorted)
+for wc, df in full.groupby('weight_class'):
+    df = df.reset_index(drop=True)
     if len(df) < 200:
         print(f'skipping class {wc} (<200 examples)')
         continue
@@ -55,6 +57,10 @@ for wc in classes:
         test=test.rename(columns={'weight_diff':'weight_delta'})
         features=[f if f!='weight_diff' else 'weight_delta' for f in features]
 
+    # the holdout tensors only depend on the split, so normalize once
+    # instead of once per grid configuration
+    test_ds=FeatureDataset(test, features)
+
     best_acc=0.0
     best_cfg=None
     # grid search for best hyperparameters
@@ -67,10 +73,9 @@ for wc in classes:
             continue
         model.eval()
         with torch.no_grad():
-            ds=FeatureDataset(test, features)
-            logits=model(ds.features)
+            logits=model(test_ds.features)
             preds=(torch.sigmoid(logits)>0.5).float()
-            corr=(preds==ds.labels).float().sum().item()
+            corr=(preds==test_ds.labels).float().sum().item()
         acc=corr/len(test)
         print(f'  cfg h1={h1} h2={h2} -> acc={acc:.2%}')
         if acc>best_acc:
@@ -90,8 +95,7 @@ for wc in classes:
             print(f"    saved ensemble model {outpath}")
         # evaluate ensemble on the holdout
         with torch.no_grad():
-            ds=FeatureDataset(test, features)
-            xs=ds.features
+            xs=test_ds.features
             logits_sum = torch.zeros_like(xs[:,0:1])
             for i in range(3):
                 m = UFCPredictor(input_dim=len(features), hidden1=h1, hidden2=h2)
@@ -99,7 +103,7 @@ for wc in classes:
                 m.eval()
                 logits_sum += torch.sigmoid(m(xs))
             preds = (logits_sum/3.0 > 0.5).float()
-            corr = (preds==ds.labels).float().sum().item()
+            corr = (preds==test_ds.labels).float().sum().item()
             ens_acc = corr/len(test)
             print(f"    ensemble accuracy on holdout: {ens_acc:.2%}")
     # continue next class even if some configs fail
@@ -26,8 +26,9 @@ classes=sorted(df['weight_class'].dropna().unique())
 
 print('classes',classes)
 
-for wc in classes:
-    sub=df[df['weight_class']==wc].reset_index(drop=True)
+# one groupby pass instead of a boolean-mask scan per class
+for wc, sub in df.groupby('weight_class'):
+    sub=sub.reset_index(drop=True)
     if len(sub)<200:
         continue
     print(f'class {wc} size {len(sub)}')
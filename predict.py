@@ -1,4 +1,5 @@
 import argparse
+import hashlib, json, re
 import pandas as pd, torch, os
 from model.neural_network import UFCPredictor, FeatureDataset
 
@@ -24,6 +25,13 @@ FEATURE_FILES=[
 # helper to load merged data once, with simple on-disk cache
 CACHE_FILE = 'merged_features.pkl'
 
+# pyarrow's multi-threaded reader is used for the TSVs when it is installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
 def load_merged():
     """Return the merged DataFrame of all feature files.
 
@@ -51,7 +59,7 @@ def load_merged():
             except Exception:
                 pass  # fall through to rebuild
     # rebuild
-    dfs = [pd.read_csv(f, sep='\t') for f in FEATURE_FILES]
+    dfs = [pd.read_csv(f, sep='\t', engine=CSV_ENGINE) for f in FEATURE_FILES]
     df = dfs[0]
     for other in dfs[1:]:
         on=['r_fighter','b_fighter','winner']
@@ -90,19 +98,20 @@ def compute_player_averages(df):
     # compute mean of each numeric column grouped by fighter
     # only average numeric columns (weight_class is string, etc.)
     grouped = allf.groupby('fighter', dropna=False).mean(numeric_only=True)
+    grouped = grouped[grouped.index.notna()]
+
+    # split into diff and raw with whole-frame conversions rather than
+    # walking the grouped frame one Series at a time
+    avgdiff = grouped[[c for c in diff_cols if c in grouped.columns]].to_dict('index')
+    avgraw = grouped[[c for c in raw_cols if c in grouped.columns]].to_dict('index')
+    wcs = grouped['weight_class'].to_dict() if 'weight_class' in grouped.columns else {}
 
     players = {}
-    for fighter, row in grouped.iterrows():
-        if pd.isna(fighter):
-            continue
-        stats = row.to_dict()
-        # split into diff and raw
-        avgdiff = {c:stats[c] for c in diff_cols if c in stats}
-        avgraw = {c:stats[c] for c in raw_cols if c in stats}
-        wc = None
-        if 'weight_class' in stats and not pd.isna(stats['weight_class']):
-            wc = stats['weight_class']
-        players[fighter] = {'diff':avgdiff, 'raw':avgraw, 'weight_class':wc}
+    for fighter in grouped.index:
+        wc = wcs.get(fighter)
+        if wc is not None and pd.isna(wc):
+            wc = None
+        players[fighter] = {'diff':avgdiff[fighter], 'raw':avgraw[fighter], 'weight_class':wc}
     return players
 
 # given two fighter names and averages, make a feature row
@@ -133,13 +142,12 @@ def synthesize_row(f1,f2,players):
     return pd.DataFrame([row])
 
 # load ensembles similar to ensemble_predict
-import re
+CHECKPOINT_RE = re.compile(r'^(.*)_e\d+\.pt$')
 
 def load_ensembles():
     ensembles={}
-    pat=re.compile(r'^(.*)_e\d+\.pt$')
     for fname in os.listdir('model/checkpoints'):
-        m=pat.match(fname)
+        m=CHECKPOINT_RE.match(fname)
         if m:
             wc=m.group(1)
             # checkpoint filenames use underscores instead of spaces
@@ -148,18 +156,36 @@ def load_ensembles():
     return ensembles
 
 
+# networks keyed by (checkpoint, input_dim) so each file is read from disk
+# once per process rather than once per prediction
+_model_cache = {}
+
+def load_model(path, input_dim):
+    """Return the eval-mode network stored at ``path``, or None if it
+    cannot be loaded.  Results (including failures) are cached."""
+    key = (path, input_dim)
+    if key not in _model_cache:
+        m = UFCPredictor(input_dim=input_dim, hidden1=64, hidden2=32)
+        try:
+            m.load_state_dict(torch.load(path))
+            m.eval()
+        except Exception:
+            m = None
+        _model_cache[key] = m
+    return _model_cache[key]
+
+
 def build_match_index(df):
-    """Return a dict mapping (fighter1,fighter2) -> (row, swapped).
+    """Return a dict mapping (fighter1,fighter2) -> (pos, swapped).
 
-    The ``row`` is the original pandas Series from the merged
-    dataframe. ``swapped`` is True if the pair entry is the reverse of
-    the stored row (i.e. fighter1 was blue)."""
+    ``pos`` is the position of the contest in the merged dataframe; the
+    row itself is only materialized by ``get_match_row`` for the pair
+    that is actually requested. ``swapped`` is True if the pair entry is
+    the reverse of the stored row (i.e. fighter1 was blue)."""
     idx = {}
-    for _, row in df.iterrows():
-        r = row['r_fighter']
-        b = row['b_fighter']
-        idx[(r,b)] = (row, False)
-        idx[(b,r)] = (row, True)
+    for pos, (r, b) in enumerate(zip(df['r_fighter'], df['b_fighter'])):
+        idx[(r,b)] = (pos, False)
+        idx[(b,r)] = (pos, True)
     return idx
 
 
@@ -194,15 +220,16 @@ def predict_from_row(df_row, ensembles, features):
     # normalize row using FeatureDataset
     ds=FeatureDataset(df_row, features)
     xs=ds.features
-    logits_sum=torch.zeros_like(xs)
+    if len(xs)==0:
+        return None  # row dropped for missing features
+    # one probability per row; zeros_like(xs) was (1, F) and made the
+    # .item() below raise whenever there was more than one feature
+    logits_sum=torch.zeros(len(xs), 1)
     count=0
     for mf in ensembles[wc]:
-        m=UFCPredictor(input_dim=xs.shape[1], hidden1=64, hidden2=32)
-        try:
-            m.load_state_dict(torch.load(mf))
-        except Exception:
+        m=load_model(mf, xs.shape[1])
+        if m is None:
             continue
-        m.eval()
         with torch.no_grad():
             logits_sum += torch.sigmoid(m(xs))
         count+=1
@@ -219,51 +246,90 @@ def compute_ensemble_accuracy(df, features, ensembles):
     """
     correct = 0
     total = 0
-    for _, row in df.iterrows():
-        wc = row.get('weight_class', None)
-        if wc is None or wc not in ensembles:
+    if 'weight_class' not in df.columns:
+        return 0.0
+    for wc, grp in df.groupby('weight_class', sort=False):
+        if wc not in ensembles:
             continue
-        # craft a one-row df so FeatureDataset normalizes properly
-        one = pd.DataFrame([row])
-        ds = FeatureDataset(one, features)
-        xs = ds.features
-        logits_sum = torch.zeros_like(xs)
+        # contests with missing features are left out; a one-row
+        # FeatureDataset for them used to be empty and avg.item() raised
+        grp = grp.dropna(subset=features)
+        if grp.empty:
+            continue
+        # normalize each contest through its own one-row FeatureDataset as
+        # before, but stack them so every checkpoint scores the whole class
+        # in a single forward pass instead of one pass per contest
+        xs = torch.cat([FeatureDataset(grp.iloc[[i]], features).features
+                        for i in range(len(grp))])
+        probs_sum = torch.zeros(len(grp), 1)
         loaded = 0
         for mf in ensembles[wc]:
-            try:
-                m = UFCPredictor(input_dim=xs.shape[1], hidden1=64, hidden2=32)
-                m.load_state_dict(torch.load(mf))
-            except Exception:
+            m = load_model(mf, xs.shape[1])
+            if m is None:
                 continue
-            m.eval()
             with torch.no_grad():
-                logits_sum += torch.sigmoid(m(xs))
+                probs_sum += torch.sigmoid(m(xs))
             loaded += 1
         if loaded == 0:
             continue
-        avg = logits_sum / loaded
-        pred = 'Red' if avg.item() > 0.5 else 'Blue'
-        actual = row['winner']
-        if pred == actual:
-            correct += 1
-        total += 1
+        avg = (probs_sum / loaded).squeeze(1).numpy()
+        pred = pd.Series(avg > 0.5, index=grp.index).map({True: 'Red', False: 'Blue'})
+        correct += int((pred == grp['winner']).sum())
+        total += len(grp)
     return correct / total if total else 0.0
 
 
+# accuracy from the last run together with a digest of its inputs
+ACCURACY_CACHE_FILE = 'ensemble_accuracy.json'
+
+def cached_ensemble_accuracy(df, features, ensembles):
+    """Return ``compute_ensemble_accuracy`` reusing an on-disk result.
+
+    Evaluating every ensemble over the whole merged dataframe gives the
+    same number on every invocation until the data or the models change,
+    so the result is stored in ``ACCURACY_CACHE_FILE`` as a single
+    ``{"key": ..., "accuracy": ...}`` entry. The key covers the feature
+    names plus the mtime of every feature file and checkpoint;
+    re-extracting or retraining therefore forces a fresh evaluation,
+    which overwrites the stored entry.
+    """
+    parts = [','.join(features)]
+    paths = list(FEATURE_FILES) + [p for wc in sorted(ensembles) for p in ensembles[wc]]
+    for f in paths:
+        try:
+            parts.append(f'{f}:{os.path.getmtime(f)}')
+        except OSError:
+            parts.append(f'{f}:missing')
+    key = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    if os.path.exists(ACCURACY_CACHE_FILE):
+        try:
+            with open(ACCURACY_CACHE_FILE) as fp:
+                cached = json.load(fp)
+            if cached.get('key') == key:
+                return cached['accuracy']
+        except Exception:
+            pass  # unreadable cache, rebuild
+    acc = compute_ensemble_accuracy(df, features, ensembles)
+    try:
+        with open(ACCURACY_CACHE_FILE, 'w') as fp:
+            json.dump({'key': key, 'accuracy': acc}, fp)
+    except Exception:
+        pass
+    return acc
+
+
 def get_match_row(f1, f2, df, match_index):
     entry = match_index.get((f1, f2))
     if entry is None:
         return None
-    row, swapped = entry
-    row = row.to_frame().T.copy()
+    pos, swapped = entry
+    row = df.iloc[[pos]].copy()
     if swapped:
         # flip as before
         row['r_fighter'], row['b_fighter'] = row['b_fighter'], row['r_fighter']
-        if 'age_diff' in row.columns:
-            row['age_diff'] = -row['age_diff']
-        for c in row.columns:
-            if 'diff' in c and c not in ['age_diff']:
-                row[c] = -row[c]
+        diff_cols = [c for c in row.columns if 'diff' in c]
+        row[diff_cols] = -row[diff_cols]
     if 'weight_class' in row.columns:
         val = row.at[row.index[0], 'weight_class']
         if isinstance(val, pd.Series):
@@ -294,17 +360,21 @@ def main():
             return
 
     base={'r_fighter','b_fighter','winner','weight_class'}
-    features=[c for c in row.columns if c not in base]
-
-    # compute and display ensemble accuracy on merged data once
-    acc = compute_ensemble_accuracy(df, features, ensembles)
+    # take the order from the merged frame: a synthesized row is built from
+    # sets, so its column order varies with the hash seed, and both the
+    # models and the accuracy cache key depend on this order
+    features=[c for c in df.columns if c in row.columns and c not in base]
 
     winner = predict_from_row(row, ensembles, features)
     if winner is None:
+        # nothing to report, so skip evaluating every ensemble
         print('no model available for weight class', row.get('weight_class'))
-    else:
-        print(f'predicted winner: {winner}')
-        print(f'ensemble accuracy on training data: {acc:.2%}')
+        return
+
+    # compute and display ensemble accuracy on merged data once
+    acc = cached_ensemble_accuracy(df, features, ensembles)
+    print(f'predicted winner: {winner}')
+    print(f'ensemble accuracy on training data: {acc:.2%}')
 
 if __name__=='__main__':
     main()